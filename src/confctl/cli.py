@@ -2,31 +2,64 @@ import asyncio
 import os
 import signal
 import sys
+import typing as t
 from pathlib import Path
 
-from rich.console import Console
-from rich.live import Live
-
 from confctl.wire.channel import create_channel
 from confctl.deps.worker import run_worker
-from confctl.ui import OpsView
+
+if t.TYPE_CHECKING:
+    from rich.live import Live
+
+
+def get_jobs() -> int:
+    """Number of specs built concurrently, `$CONFCTL_JOBS` (1 if unset or empty)."""
+    raw_jobs = os.getenv("CONFCTL_JOBS") or "1"
+    try:
+        jobs = int(raw_jobs)
+    except ValueError:
+        jobs = 0
+    if jobs < 1:
+        print(
+            f"confctl: CONFCTL_JOBS must be a positive integer, got {raw_jobs!r}",
+            file=sys.stderr,
+        )
+        sys.exit(2)
+    return jobs
+
+
+async def refresh_ui(live: "Live", refresh_per_second: float = 10):
+    """Redraws UI from the event loop, so UI state is never touched from another thread."""
+    while True:
+        live.refresh()
+        await asyncio.sleep(1 / refresh_per_second)
 
 
 async def tui_app():
+    # TUI modules are heavy to import and not needed in the worker process
+    from rich.console import Console
+    from rich.live import Live
+
+    from confctl.ui import OpsView
+
     specs: list[str] = sys.argv[1:]
     configs_root = Path(os.getenv("CONFCTL_CONFIGS_ROOT", str(Path.cwd())))
+    jobs = get_jobs()
 
     ui_channel_end, worker_channel_end = create_channel()
 
     ui = OpsView()
 
     stop_worker = run_worker(
-        specs=specs, configs_root=configs_root, events_channel=worker_channel_end
+        specs=specs,
+        configs_root=configs_root,
+        events_channel=worker_channel_end,
+        jobs=jobs,
     )
 
     try:
         with Live(
-            ui, refresh_per_second=10, vertical_overflow="crop", screen=True
+            ui, auto_refresh=False, vertical_overflow="crop", screen=True
         ) as live:
 
             def _sig_handler():
@@ -38,7 +71,11 @@ async def tui_app():
             loop.add_signal_handler(signal.SIGINT, _sig_handler)
             loop.add_signal_handler(signal.SIGTERM, _sig_handler)
 
-            await ui.listen_to_channel(ui_channel_end)
+            refresh_task = asyncio.create_task(refresh_ui(live))
+            try:
+                await ui.listen_to_channel(ui_channel_end)
+            finally:
+                refresh_task.cancel()
 
         stop_worker()
 
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import json
+import threading
 import typing as t
 
 from confctl.deps.resolvers.simple import simple_resolver
@@ -9,6 +10,44 @@ if t.TYPE_CHECKING:
     from confctl.deps.actions import Action
 
 
+class PipxInfo:
+    """
+    `pipx list` output shared by the pipx deps of a build run (kept in the global
+    context), it's the same until something gets installed.
+    """
+
+    ctx_key = "_pipx_info"
+    # guards creating the shared instance
+    _setup_lock = threading.Lock()
+
+    def __init__(self) -> None:
+        self._info: dict | None = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def of(cls, act: Action) -> PipxInfo:
+        global_ctx = act.global_ctx
+        with cls._setup_lock:
+            pipx_info = global_ctx.get(cls.ctx_key)
+            if pipx_info is None:
+                pipx_info = global_ctx[cls.ctx_key] = cls()
+        return pipx_info
+
+    def get(self, act: Action) -> dict:
+        with self._lock:
+            if self._info is None:
+                run_sh = act.resolve_action("run/sh")
+                ret = run_sh("pipx list --json 2>/dev/null")
+                pipx_info = json.loads(ret.output)
+                assert pipx_info["pipx_spec_version"] == "0.1"
+                self._info = pipx_info
+            return self._info
+
+    def invalidate(self):
+        with self._lock:
+            self._info = None
+
+
 def pipx(act: Action):
     dep = act.caller
     spec = dep.spec
@@ -23,16 +62,17 @@ def pipx(act: Action):
 
     package_spec = f"{package}=={version}" if version else package
 
-    ret = run_sh(f"pipx list --json 2>/dev/null")
-    pipx_info = json.loads(ret.output)
-    assert pipx_info["pipx_spec_version"] == "0.1"
+    shared_pipx_info = PipxInfo.of(act)
+    pipx_info = shared_pipx_info.get(act)
 
     package_info = pipx_info["venvs"].get(package)
 
     if package_info:
         installed_version = package_info["metadata"]["main_package"]["package_version"]
         if not installed_version.startswith(version or ''):
-            if run_sh(f"pipx install --force {package_spec}"):
+            ret = run_sh(f"pipx install --force {package_spec}")
+            shared_pipx_info.invalidate()
+            if ret:
                 act.progress(status='installed')
                 return 'installed'
 
@@ -40,7 +80,9 @@ def pipx(act: Action):
         return 'unchanged'
 
     # no info about the package, need to install it
-    elif run_sh(f"pipx install {package_spec}"):
+    ret = run_sh(f"pipx install {package_spec}")
+    shared_pipx_info.invalidate()
+    if ret:
         act.progress(status='installed')
         return 'installed'
 
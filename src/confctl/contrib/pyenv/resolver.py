@@ -5,6 +5,7 @@ from dataclasses import dataclass, field
 
 from confctl.deps.ctx import Ctx
 from confctl.deps.dep import Dep
+from confctl.deps.in_progress import InProgress
 from .actions import install, state
 from .spec import parse_pyenv_spec, PyEnvSpec
 
@@ -26,16 +27,20 @@ class PyEnvDep(Dep):
         return self
 
     def __hash__(self) -> int:
-        return hash(self.spec)
+        return self._hash
 
 
 class PyEnvResolver:
     name = "pyenv"
 
     _resolved: dict[str, PyEnvDep]
+    # resolved deps by the exact spec string, lets repeated specs skip parsing
+    _resolved_raw: dict[str, PyEnvDep]
 
     def __init__(self) -> None:
         self._resolved = {}
+        self._resolved_raw = {}
+        self._in_progress = InProgress()
 
     def can_resolve(self, raw_spec: str, ctx: Ctx):
         if raw_spec.startswith(f"{self.name}::"):
@@ -43,18 +48,33 @@ class PyEnvResolver:
         return False
 
     def resolve(self, raw_spec: str, ctx: Ctx) -> PyEnvDep:
+        if (d := self._resolved_raw.get(raw_spec)) is not None:
+            return d
+
         spec = parse_pyenv_spec(raw_spec)
 
-        if spec.fqn in self._resolved:
-            return self._resolved[spec.fqn]
+        with self._in_progress:
+            # The same python requested from another thread waits until it's installed
+            self._in_progress.wait(spec.fqn)
+
+            if spec.fqn in self._resolved:
+                d = self._resolved[spec.fqn]
+                if not self._in_progress.is_building(spec.fqn):
+                    self._resolved_raw[raw_spec] = d
+                return d
 
-        self._resolved[spec.fqn] = d = PyEnvDep(
-            spec=spec, ctx=ctx.new_child(), actions=[install, state]
-        )
+            self._resolved[spec.fqn] = d = PyEnvDep(
+                spec=spec, ctx=ctx.new_child(), actions=[install, state]
+            )
+            self._in_progress.start(spec.fqn)
 
-        if spec.target == "python":
-            d.install()
+        try:
+            if spec.target == "python":
+                d.install()
+        finally:
+            self._in_progress.finish(spec.fqn)
 
+        self._resolved_raw[raw_spec] = d
         return d
 
 
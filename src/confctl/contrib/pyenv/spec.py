@@ -3,7 +3,7 @@ from dataclasses import dataclass
 from confctl.deps.spec import parse_spec, Spec
 
 
-@dataclass
+@dataclass(frozen=True)
 class PyEnvSpec(Spec):
     target: str
     version: str
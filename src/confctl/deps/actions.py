@@ -1,11 +1,21 @@
+import codecs
+import io
+import os
+import pty
+import selectors
+import shlex
+import shutil
+import subprocess
 import typing as t
 
 from dataclasses import dataclass
 from functools import cached_property
-from functools import wraps
-from inspect import signature
+from functools import lru_cache, partial, wraps
+from inspect import Parameter, Signature, signature
 from pathlib import Path
 
+from confctl.utils.fs import ensure_dir, expand_path
+from confctl.utils.template import compile_template, render_literal, render_template
 from confctl.wire.events import OpWrapper
 from .ctx import Ctx
 from .dep import Dep
@@ -46,14 +56,87 @@ class Action:
         return self.tracking(**kwargs)
 
 
+def arguments_binder(fn_sig: Signature) -> t.Callable[[tuple, dict], dict]:
+    """
+    Prepares a function that does `fn_sig.bind(...)` + `apply_defaults()`, skipping
+    the first parameter (the `Action` argument).
+
+    The parameters are sorted out once, so binding is a few dict operations per call.
+    Anything unusual (e.g. wrong arguments) falls back to `Signature.bind`.
+    """
+    _, *params = fn_sig.parameters.values()
+    positional = [
+        p for p in params if p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD)
+    ]
+    keyword_only = [p for p in params if p.kind == p.KEYWORD_ONLY]
+    var_positional = next((p.name for p in params if p.kind == p.VAR_POSITIONAL), None)
+    var_keyword = next((p.name for p in params if p.kind == p.VAR_KEYWORD), None)
+
+    def _slow_bind(args: tuple, kwargs: dict) -> dict:
+        bound = fn_sig.bind(None, *args, **kwargs)
+        bound.apply_defaults()
+        arguments = bound.arguments
+        del arguments[next(iter(arguments))]
+        return arguments
+
+    def _bind(args: tuple, kwargs: dict) -> dict:
+        arguments = dict(zip((p.name for p in positional), args))
+        if (len(args) > len(positional) and var_positional is None) or any(
+            name in kwargs for name in arguments
+        ):
+            # unexpected or duplicated arguments
+            return _slow_bind(args, kwargs)
+
+        rest_kwargs = dict(kwargs)
+
+        for p in positional[len(args) :]:
+            if p.name in rest_kwargs and p.kind != p.POSITIONAL_ONLY:
+                arguments[p.name] = rest_kwargs.pop(p.name)
+            elif p.default is not Parameter.empty:
+                arguments[p.name] = p.default
+            else:
+                return _slow_bind(args, kwargs)
+
+        if var_positional is not None:
+            arguments[var_positional] = args[len(positional) :]
+
+        for p in keyword_only:
+            if p.name in rest_kwargs:
+                arguments[p.name] = rest_kwargs.pop(p.name)
+            elif p.default is not Parameter.empty:
+                arguments[p.name] = p.default
+            else:
+                return _slow_bind(args, kwargs)
+
+        if var_keyword is not None:
+            arguments[var_keyword] = rest_kwargs
+        elif rest_kwargs:
+            return _slow_bind(args, kwargs)
+
+        return arguments
+
+    return _bind
+
+
 def action(
     action_name: str,
     *,
     auto_ops_wrapper: bool = True,
     prep_track_data=lambda a, d: d,
     failsafe: bool = False,
+    skip_tracking_if: t.Callable[..., bool] | None = None,
 ):
+    """
+    Turns `fn` into an action.
+
+    `skip_tracking_if` is called with the action arguments, the call is not tracked
+    as an op if it returns `True` (e.g. for trivial calls that would only add noise).
+    """
+
     def _decorator(fn: t.Callable):
+        # the first argument (`action_arg`) is not tracked
+        bind_arguments = arguments_binder(signature(fn))
+
         @wraps(fn)
         def _fn(*args, **kwargs):
             ctx: Ctx = kwargs.pop("__ctx")
@@ -64,17 +147,13 @@ def action(
                 tracking=ctx.ops.get_track_fn(action=action_name),
             )
 
-            if auto_ops_wrapper:
+            if auto_ops_wrapper and not (
+                skip_tracking_if is not None and skip_tracking_if(*args, **kwargs)
+            ):
                 action_src = caller.spec.fqn if caller else "(global)"
 
                 # Track what arguments we pass to the action function
-                fn_sig = signature(fn)
-                _track_kwargs = fn_sig.bind(action_arg, *args, **kwargs)
-                _track_kwargs.apply_defaults()
-                # the first argument (`action_arg`) should not be tracked
-                _first_param_name = list(fn_sig.parameters.keys())[0]
-                _track_data = _track_kwargs.arguments.copy()
-                _track_data.pop(_first_param_name)
+                _track_data = bind_arguments(args, kwargs)
                 # modify tracked data if necessary (by calling `prep_track_data`)
                 _track_data = prep_track_data(action_arg, _track_data)
 
@@ -109,9 +188,7 @@ def get_action_name(fn) -> str | None:
     return None
 
 def prep_action_as_fn(fn, ctx: Ctx, caller: t.Any = None):
-    return lambda *args, **kwargs: fn(
-        *args, **kwargs, __ctx=ctx, __caller=caller
-    )
+    return partial(fn, __ctx=ctx, __caller=caller)
 
 #
 # Common actions
@@ -132,22 +209,27 @@ def msg(act: Action, msg: str, **extra_context):
     prep_track_data=lambda a, d: dict(
         template=d["template"], rest_keys=list(d["extra_context"])
     ),
+    # nothing to show for strings which are not templates (a quick check only, the
+    # body tells literal strings apart exactly)
+    skip_tracking_if=lambda template, **_: (
+        not isinstance(template, str) or ("{" not in template and "\r" not in template)
+    ),
 )
 def render_str(act: Action, template: str, **extra_context):
-    from confctl.utils.template import Template
-
     if isinstance(template, str):
+        if (rendered := render_literal(template)) is not None:
+            return rendered
+
         dep_fn = act.resolve_action("use/dep")
-        template_ctx = act.execution_ctx
+        template_ctx = act.execution_ctx.flatten()
 
         if extra_context:
-            template_ctx = template_ctx.new_child(extra_context)
+            template_ctx.update(extra_context)
 
-        compiled_template = Template(template)
-        compiled_template.globals["dep"] = dep_fn
+        compiled_template = compile_template(template)
         # compiled_template.filters["arg"] = shlex.quote
 
-        rendered = compiled_template.render(template_ctx)
+        rendered = render_template(compiled_template, template_ctx, dep=dep_fn)
         act.progress(rendered=rendered)
         return rendered
     return template
@@ -163,22 +245,22 @@ def render(act: Action, src: str | Path, dst: str | Path, **extra_context):
     current_config_dir: Path | None = act.execution_ctx.get("current_config_dir")
     render_str_fn = act.resolve_action("render/str")
 
-    src = Path(render_str_fn(src)).expanduser()
-    dst = Path(render_str_fn(dst)).expanduser()
+    src = expand_path(render_str_fn(src))
+    dst = expand_path(render_str_fn(dst))
 
-    if isinstance(current_config_dir, Path):
+    # joining an absolute path gives the same path, nothing to check then
+    if isinstance(current_config_dir, Path) and not src.is_absolute():
         relative_src = current_config_dir / src
         if relative_src.exists():
             src = current_config_dir / src
 
     act.progress(src=src, dst=dst)
 
-    dst.parent.mkdir(parents=True, exist_ok=True)
+    ensure_dir(dst.parent)
 
-    with src.open("rt") as f_in, dst.open("wt") as f_out:
-        rendered_content = render_str_fn(f_in.read(), **extra_context)
-        act.progress(rendered_content=rendered_content)
-        f_out.write(rendered_content)
+    rendered_content = render_str_fn(src.read_text(), **extra_context)
+    act.progress(rendered_content=rendered_content)
+    dst.write_text(rendered_content)
 
 
 @action("use/dep")
@@ -193,6 +275,7 @@ def dep(act: Action, spec: str, /):
 @dataclass
 class CommandExecutionResult:
     exitcode: int
+    # output pieces as they were read (not necessarily whole lines)
     logs: list[str]
 
     def __bool__(self) -> bool:
@@ -206,10 +289,93 @@ class CommandExecutionResult:
         return log in self.output
 
 
+def read_text(
+    fd: int,
+    chunk_size: int = 65536,
+    is_done: t.Callable[[], bool] | None = None,
+    poll_interval: float = 0.1,
+) -> t.Iterator[str]:
+    """
+    Reads text from `fd` until EOF, yields the text decoded from each read.
+
+    Reads whatever is available (up to `chunk_size`) with a single syscall and decodes
+    it at once, newlines are translated the same way as for text mode files.
+
+    If `is_done` is given, it's checked whenever nothing has come for `poll_interval`
+    seconds; once it returns `True` the remaining data is drained without waiting for
+    EOF (e.g. a background process may keep the pipe open after the command exited).
+    """
+    decoder = io.IncrementalNewlineDecoder(
+        codecs.getincrementaldecoder("utf8")(errors="replace"), translate=True
+    )
+
+    done = False
+    with selectors.DefaultSelector() as selector:
+        selector.register(fd, selectors.EVENT_READ)
+        while True:
+            if not selector.select(0 if done else poll_interval):
+                if done:
+                    break
+                done = is_done is not None and is_done()
+                continue
+
+            if not (chunk := os.read(fd, chunk_size)):
+                break
+
+            if text := decoder.decode(chunk):
+                yield text
+
+    if text := decoder.decode(b"", final=True):
+        yield text
+
+
+# Characters that make the shell do something else than running a plain command
+SHELL_SPECIAL_CHARS = frozenset("|&;<>()[]{}$`\\\"'*?~#=!%\n")
+
+# Shell builtins and reserved words: even if there is a program with the same name
+# (e.g. `echo`, `printf`, `kill`, `test`, `time`, `pwd`), it behaves differently
+SHELL_KEYWORDS = frozenset(
+    """
+    ! . : [ [[ ]] { } alias bg bind break builtin caller case cd command compgen
+    complete continue coproc declare dirs disown do done echo elif else enable esac
+    eval exec exit export false fc fg fi for function getopts hash help history if
+    in jobs kill let local logout mapfile popd printf pushd pwd read readarray
+    readonly return select set shift shopt source suspend test then time times trap
+    true type typeset ulimit umask unalias unset until wait while
+    """.split()
+)
+
+
+@lru_cache(maxsize=1024)
+def find_program(program: str, path: str) -> str | None:
+    """`shutil.which`, commands (and PATH) repeat a lot in builds."""
+    return shutil.which(program, path=path)
+
+
+def split_simple_cmd(cmd: str, env: dict | None = None) -> list[str] | None:
+    """
+    Splits `cmd` into arguments if it can be executed without a shell.
+
+    Returns `None` for anything using shell syntax, for shell builtins and reserved
+    words (even if a program with the same name exists) and for programs that are
+    not found in PATH.
+    """
+    if any(c in SHELL_SPECIAL_CHARS for c in cmd):
+        return None
+
+    argv = cmd.split()
+    if not argv or argv[0] in SHELL_KEYWORDS:
+        return None
+
+    environ = os.environ if env is None else env
+    if find_program(argv[0], environ.get("PATH", os.defpath)) is None:
+        return None
+
+    return argv
+
+
 @action("run/sh")
 def sh(act: Action, cmd: str, env: dict | None = None, log_progress: bool = True):
-    import subprocess
-
     render_str_fn = act.resolve_action("render/str")
 
     logs: list[str] = []
@@ -217,36 +383,45 @@ def sh(act: Action, cmd: str, env: dict | None = None, log_progress: bool = True
     cmd = render_str_fn(cmd)
     act.progress(cmd=cmd)
 
+    # Spare a shell process for simple commands
+    argv = split_simple_cmd(cmd, env)
+
     with subprocess.Popen(
-        cmd,
+        cmd if argv is None else argv,
         stdin=subprocess.PIPE,
         stdout=subprocess.PIPE,
         stderr=subprocess.STDOUT,
-        shell=True,
-        text=True,
+        shell=argv is None,
         env=env,
     ) as process:
         act.progress(pid=process.pid)
 
-        while process.poll() is None:
-            if process.stdout is not None:
-                for log in process.stdout.readlines():
-                    if log_progress:
-                        act.log(log)
-                    logs.append(log)
-
         if process.stdout is not None:
-            for log in process.stdout.readlines():
+            # one log event (and one stored piece) per read instead of per line
+            for log in read_text(
+                process.stdout.fileno(), is_done=lambda: process.poll() is not None
+            ):
                 if log_progress:
                     act.log(log)
                 logs.append(log)
 
+        exitcode = process.wait()
+        if exitcode < 0:
+            # killed by a signal, report it the way the shell does
+            exitcode = 128 - exitcode
+
+        result = CommandExecutionResult(exitcode=exitcode, logs=logs)
+
         if not log_progress:
-            act.log(''.join(logs))
+            act.log(result.output)
+
+        act.progress(exitcode=exitcode)
+
+    return result
 
-        act.progress(exitcode=process.returncode)
 
-    return CommandExecutionResult(exitcode=process.returncode, logs=logs)
+# sudo is asked to show this prompt, so we know when the password is expected
+SUDO_PROMPT = b"SUDO_USER_PASSWORD_PROMPT"
 
 
 @action("run/sudo")
@@ -254,10 +429,6 @@ def sudo(act: Action, cmd: str):
     """
     Runs command with super user perms.
     """
-    import os
-    import pty
-    import shlex
-
     render_str_fn = act.resolve_action("render/str")
 
     cmd = render_str_fn(cmd)
@@ -266,7 +437,7 @@ def sudo(act: Action, cmd: str):
     cmd_parts = [
         "/usr/bin/sudo",
         "-p",
-        "SUDO_USER_PASSWORD_PROMPT",
+        SUDO_PROMPT.decode(),
         *shlex.split(cmd),
     ]
 
@@ -276,27 +447,40 @@ def sudo(act: Action, cmd: str):
             data = data[n:]
 
     logs = []
+    # a multi-byte character can be split between reads
+    decoder = codecs.getincrementaldecoder("utf8")(errors="replace")
 
+    # the prompt is searched for (until the password is sent) in each read plus
+    # the tail of the previous one, in case the prompt is split between reads
+    prompt_window = b""
     sent_passwd = False
 
     def read(fd):
-        nonlocal sent_passwd
-
-        data = os.read(fd, 1024)
-        logs.append(data.decode("utf8"))
-
-        if not sent_passwd and "SUDO_USER_PASSWORD_PROMPT" in "".join(logs):
-            passwd = os.getenv("CONFCTL_SUDO_PASS", "none")
-            write(
-                fd,
-                "{}\n".format(passwd).encode("utf8"),
-            )
-            sent_passwd = True
-
-        act.log(data.decode("utf8"))
+        nonlocal sent_passwd, prompt_window
+
+        data = os.read(fd, 65536)
+        log = decoder.decode(data)
+        logs.append(log)
+
+        if not sent_passwd:
+            prompt_window += data
+            if SUDO_PROMPT in prompt_window:
+                passwd = os.getenv("CONFCTL_SUDO_PASS", "none")
+                write(
+                    fd,
+                    "{}\n".format(passwd).encode("utf8"),
+                )
+                sent_passwd = True
+            prompt_window = prompt_window[-(len(SUDO_PROMPT) - 1) :]
+
+        act.log(log)
         return data
 
     exitcode = pty.spawn(cmd_parts, read)
     act.progress(exitcode=exitcode)
 
     return CommandExecutionResult(exitcode=exitcode, logs=logs)
+
+
+# Actions available on every dependency and in the global context
+COMMON_ACTIONS = (dep, render, render_str, sh, sudo, msg)
@@ -1,3 +1,4 @@
+import itertools
 import typing as t
 
 from collections import ChainMap
@@ -11,13 +12,133 @@ if t.TYPE_CHECKING:
     from confctl.wire.events import OpsTracking
 
 
+# Any write to any context layer changes the version (contexts share their parent
+# layers)
+_versions = itertools.count(1)
+
+
+def _changed():
+    Ctx._version = next(_versions)
+
+
+class _Layer(dict):
+    """A context layer that reports its changes, so `Ctx` snapshots can be reused."""
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        _changed()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        _changed()
+
+    def __or__(self, other: t.Any) -> t.Any:
+        return _Layer(super().__or__(other))
+
+    def __ior__(self, other: t.Any) -> t.Self:
+        super().__ior__(other)
+        _changed()
+        return self
+
+    def pop(self, key, *args):
+        try:
+            return super().pop(key, *args)
+        finally:
+            _changed()
+
+    def popitem(self):
+        try:
+            return super().popitem()
+        finally:
+            _changed()
+
+    def setdefault(self, key, default=None):
+        try:
+            return super().setdefault(key, default)
+        finally:
+            _changed()
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        _changed()
+
+    def clear(self):
+        super().clear()
+        _changed()
+
+    def copy(self):
+        return _Layer(self)
+
+
 class Ctx(ChainMap):
+    """
+    Layered context (see `ChainMap`).
+
+    Lookups are served from a merged snapshot of the layers while none of them
+    changes. Only layers created by `Ctx` itself (`Ctx()`, `new_child()`) report
+    their changes; a context with any other mapping among its layers (e.g.
+    `new_child(some_dict)`) looks values up through the layers every time.
+    """
+
     # Globally available context values
     global_ctx: "Ctx"
     registry: "Registry"
     ops: "OpsTracking"
     configs_root: Path
 
+    _version: t.ClassVar[int] = 0
+    # (version, number of layers, merged layers) used for lookups while nothing has
+    # been written
+    _snapshot: tuple[int, int, dict] | None = None
+
+    def __init__(self, *maps):
+        super().__init__(*maps or [_Layer()])
+
+    def new_child(self, m=None, **kwargs):
+        if m is None:
+            m = _Layer(kwargs)
+        elif kwargs:
+            m.update(kwargs)
+        return self.__class__(m, *self.maps)
+
+    def _merged(self) -> dict | None:
+        version = Ctx._version
+        snapshot = self._snapshot
+        if (
+            snapshot is not None
+            and snapshot[0] == version
+            and snapshot[1] == len(self.maps)
+        ):
+            return snapshot[2]
+
+        if not all(type(mapping) is _Layer for mapping in self.maps):
+            # changes of foreign mappings cannot be noticed
+            return None
+
+        merged: dict = {}
+        for mapping in reversed(self.maps):
+            merged.update(mapping)
+        self._snapshot = version, len(self.maps), merged
+        return merged
+
+    def __getitem__(self, key):
+        merged = self._merged()
+        if merged is None:
+            return super().__getitem__(key)
+        return merged[key]
+
+    def __contains__(self, key):
+        merged = self._merged()
+        if merged is None:
+            return super().__contains__(key)
+        return key in merged
+
+    def get(self, key, default=None):
+        merged = self._merged()
+        if merged is None:
+            return super().get(key, default)
+        return merged.get(key, default)
+
     def __getattr__(self, name):
         try:
             val = self[name]
@@ -26,5 +147,21 @@ class Ctx(ChainMap):
 
         if isinstance(val, LazyTemplate):
             val = str(val)
-            self[name] = val
+            merged = self._merged()
+            if merged is None:
+                self.maps[0][name] = val
+            else:
+                # Same value, just rendered: cache it without invalidating snapshots
+                dict.__setitem__(self.maps[0], name, val)
+                merged[name] = val
         return val
+
+    def flatten(self) -> dict:
+        """Merges all context layers into a plain dict (closer layers win)."""
+        merged = self._merged()
+        if merged is None:
+            merged = {}
+            for mapping in reversed(self.maps):
+                merged.update(mapping)
+            return merged
+        return merged.copy()
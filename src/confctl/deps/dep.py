@@ -2,6 +2,7 @@ import typing as t
 
 from dataclasses import dataclass, field
 from functools import cache
+from types import MappingProxyType
 
 from .ctx import Ctx
 from .spec import Spec
@@ -16,7 +17,7 @@ class Dep:
 
     # actions that can be triggered on dependency
     actions: list[t.Callable] = field(default_factory=list)
-    _actions_map: dict[str, t.Callable] = field(default_factory=dict)
+    _actions_map: t.Mapping[str, t.Callable] = field(default_factory=dict)
 
     # do not trigger error globally
     failsafe: bool = False
@@ -28,16 +29,15 @@ class Dep:
     ui_options: UIOptions = field(default_factory=UIOptions)
 
     def __post_init__(self):
-        from .actions import get_action_name, render, render_str, dep, sh, sudo, msg
+        # specs never change, so the hash can be computed once
+        self._hash = hash(self.spec)
 
-        self.actions.extend([dep, render, render_str, sh, sudo, msg])
+        from .actions import COMMON_ACTIONS
 
-        for fn in self.actions:
-            # the actions are accessible by function name of by its alias
-            self._actions_map[fn.__name__] = fn
-            action_name = get_action_name(fn)
-            if action_name:
-                self._actions_map[action_name] = fn
+        self.actions.extend(COMMON_ACTIONS)
+
+        # deps with the same set of actions share one read-only map
+        self._actions_map = build_actions_map(tuple(self.actions))
 
     def __getattr__(self, name: str):
         """Proxies attribute access to target's configuration."""
@@ -46,15 +46,34 @@ class Dep:
         return getattr(self.ctx, name)
 
     def __hash__(self) -> int:
-        return hash(self.spec)
+        return self._hash
 
-    @cache
     def get_action(self, action_name: str):
-        from .actions import prep_action_as_fn
         fn = self._actions_map.get(action_name)
         if callable(fn):
-            return prep_action_as_fn(fn, ctx=self.ctx, caller=self)
+            # bound actions are kept as attributes, so next time they are found
+            # without getting to `__getattr__`
+            if (bound := self.__dict__.get(action_name)) is None:
+                from .actions import prep_action_as_fn
+                bound = self.__dict__[action_name] = prep_action_as_fn(
+                    fn, ctx=self.ctx, caller=self
+                )
+            return bound
 
         raise RuntimeError(
             f"Cannot resolve {action_name} action for {self.spec} dependency."
         )
+
+
+@cache
+def build_actions_map(actions: tuple[t.Callable, ...]) -> t.Mapping[str, t.Callable]:
+    from .actions import get_action_name
+
+    actions_map = {}
+    for fn in actions:
+        # the actions are accessible by function name of by its alias
+        actions_map[fn.__name__] = fn
+        action_name = get_action_name(fn)
+        if action_name:
+            actions_map[action_name] = fn
+    return MappingProxyType(actions_map)
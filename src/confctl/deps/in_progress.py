@@ -0,0 +1,58 @@
+import threading
+
+
+class InProgress:
+    """
+    Deps being built (or installed) by threads.
+
+    A thread requesting a dep that another thread is building waits until it's built,
+    unless that build (transitively) waits for the requesting thread: waiting would
+    deadlock then, so the caller gets the partially built dep, as a recursive request
+    from the same thread does.
+
+    Use it as a lock around `wait()` and the resolver's own bookkeeping.
+    """
+
+    def __init__(self) -> None:
+        # fqn -> id of the thread building it
+        self._owners: dict[str, int] = {}
+        # thread id -> fqn it waits for
+        self._waiting: dict[int, str] = {}
+        self._changed = threading.Condition()
+
+    def __enter__(self):
+        return self._changed.__enter__()
+
+    def __exit__(self, *exc_info):
+        return self._changed.__exit__(*exc_info)
+
+    def _waits_for(self, thread_id: int, fqn: str) -> bool:
+        """Checks if the build of `fqn` (transitively) waits for `thread_id`."""
+        owner = self._owners.get(fqn)
+        while owner is not None:
+            if owner == thread_id:
+                return True
+            owner = self._owners.get(self._waiting.get(owner, ""))
+        return False
+
+    def is_building(self, fqn: str) -> bool:
+        return fqn in self._owners
+
+    def wait(self, fqn: str):
+        """Waits (holding the lock) until `fqn` is built or waiting would deadlock."""
+        thread_id = threading.get_ident()
+        while fqn in self._owners and not self._waits_for(thread_id, fqn):
+            self._waiting[thread_id] = fqn
+            try:
+                self._changed.wait()
+            finally:
+                del self._waiting[thread_id]
+
+    def start(self, fqn: str):
+        """Marks `fqn` as being built by the current thread (holding the lock)."""
+        self._owners[fqn] = threading.get_ident()
+
+    def finish(self, fqn: str):
+        with self._changed:
+            del self._owners[fqn]
+            self._changed.notify_all()
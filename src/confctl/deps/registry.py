@@ -20,10 +20,24 @@ class Resolver(t.Protocol):
 class Registry:
     global_ctx: Ctx
     resolvers: list[Resolver] = field(default_factory=list)
+    # resolvers with a `name` attribute, looked up by "<name>::..." spec prefix.
+    # A named resolver claims no prefixed specs but its own, so it's looked up only
+    # while no resolver without a name (which may claim any spec) precedes it.
+    _resolvers_by_name: dict[str, Resolver] = field(default_factory=dict)
+    _has_unnamed_resolvers: bool = False
 
     def resolve(self, raw_spec: str, ctx: Ctx | None = None) -> t.Any:
         ctx = ctx or self.global_ctx
+
+        resolver_name, sep, _ = raw_spec.partition("::")
+        named = self._resolvers_by_name.get(resolver_name) if sep else None
+        if named is not None and named.can_resolve(raw_spec=raw_spec, ctx=ctx):
+            return named.resolve(raw_spec=raw_spec, ctx=ctx)
+
         for resolver in self.resolvers:
+            if resolver is named:
+                # has declined the spec already
+                continue
             if resolver.can_resolve(raw_spec=raw_spec, ctx=ctx):
                 return resolver.resolve(raw_spec=raw_spec, ctx=ctx)
 
@@ -31,6 +45,11 @@ class Registry:
 
     def register_resolver(self, resolver: Resolver):
         self.resolvers.append(resolver)
+        name = getattr(resolver, "name", None)
+        if not name:
+            self._has_unnamed_resolvers = True
+        elif not self._has_unnamed_resolvers:
+            self._resolvers_by_name.setdefault(name, resolver)
 
     def setup_resolvers(self, resolvers_refs: list[t.Any]):
         for resolver_setup_ref in resolvers_refs:
@@ -13,18 +13,40 @@ def conf(act: Action, **kw):
 
     Can be called multiple times. The last call overwrites configs with the same name.
     """
-    from confctl.utils.template import LazyTemplate
+    from confctl.utils.template import LazyTemplate, render_literal
 
     render_str_fn = act.resolve_action("render/str")
     execution_ctx = act.execution_ctx
 
-    def _nest_ctx(val):
-        if isinstance(val, t.Mapping):
-            return Ctx({k: _nest_ctx(v) for k, v in val.items()})
+    # equal strings share one (memoized) lazy template
+    lazy_templates: dict[str, LazyTemplate] = {}
+
+    def _lazy(val):
         if isinstance(val, str):
-            return LazyTemplate(val, render_str_fn)
+            # plain strings are rendered right away, there is nothing to defer
+            if (rendered := render_literal(val)) is not None:
+                return rendered
+            if val not in lazy_templates:
+                lazy_templates[val] = LazyTemplate(val, render_str_fn)
+            return lazy_templates[val]
         return val
 
+    def _nest_ctx(val):
+        if not isinstance(val, t.Mapping):
+            return _lazy(val)
+
+        nested_ctx = Ctx()
+        stack = [(nested_ctx, val)]
+        while stack:
+            node, mapping = stack.pop()
+            for k, v in mapping.items():
+                if isinstance(v, t.Mapping):
+                    node[k] = child = Ctx()
+                    stack.append((child, v))
+                else:
+                    node[k] = _lazy(v)
+        return nested_ctx
+
     for k, v in kw.items():
         execution_ctx[k] = _nest_ctx(v)
 
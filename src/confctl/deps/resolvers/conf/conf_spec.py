@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from urllib.parse import parse_qsl
 
@@ -9,7 +10,7 @@ from confctl.deps.spec import parse_spec, Spec
 CONF_RESOLVER_NAME = "conf"
 
 
-@dataclass
+@dataclass(frozen=True)
 class ConfSpec(Spec):
     conf_path: Path
     target: str
@@ -27,6 +28,15 @@ def parse_conf_spec(raw_spec: str, ctx: Ctx) -> ConfSpec:
         conf::tools/terminal:kitty
         conf::tools/i3?no-restart
     """
+    # Specs are parsed by `can_resolve` and then again by `resolve`, and the same
+    # deps are requested by many configurations
+    return _parse_conf_spec(raw_spec, ctx.configs_root, ctx.get("current_config_dir"))
+
+
+@lru_cache(maxsize=2048)
+def _parse_conf_spec(
+    raw_spec: str, configs_root: Path, current_config_dir: Path | None
+) -> ConfSpec:
     common_spec = parse_spec(
         raw_spec=raw_spec, default_resolver_name=CONF_RESOLVER_NAME
     )
@@ -57,18 +67,18 @@ def parse_conf_spec(raw_spec: str, ctx: Ctx) -> ConfSpec:
 
     conf_path_part = conf_path_part.strip()
 
-    conf_path = ctx.configs_root
+    conf_path = configs_root
 
     # try to build relative paths relatively the current configuration
     if conf_path_part.startswith(("./", "../")) or not conf_path_part:
-        conf_path = ctx.get("current_config_dir") or conf_path
+        conf_path = current_config_dir or conf_path
 
     if conf_path_part:
         conf_path = (conf_path / conf_path_part).resolve()
 
     # re-shape `spec` to show path to targes relatively the root config folder
     if spec.startswith(("./", "../", ":")):
-        spec = str(conf_path.relative_to(ctx.configs_root))
+        spec = str(conf_path.relative_to(configs_root))
         if target_name:
             spec = f"{spec}:{target_name}"
 
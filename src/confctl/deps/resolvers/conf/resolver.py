@@ -6,6 +6,7 @@ from dataclasses import dataclass
 from confctl.deps import actions
 from confctl.deps.ctx import Ctx
 from confctl.deps.dep import Dep
+from confctl.deps.in_progress import InProgress
 from confctl.utils.py_module import load_python_module, load_module_level_config
 from .actions import conf, build
 from .conf_spec import CONF_RESOLVER_NAME, parse_conf_spec, ConfSpec
@@ -19,7 +20,7 @@ class ConfDep(Dep):
     spec: ConfSpec
 
     def __hash__(self) -> int:
-        return hash(self.spec)
+        return self._hash
 
     def __call__(self, **configs):
         """
@@ -57,12 +58,14 @@ class ConfDep(Dep):
 
 
 class ConfResolver:
+    name = CONF_RESOLVER_NAME
     root_conf_dep = "conf:::main"
 
     _resolved: dict[str, ConfDep]
 
     def __init__(self) -> None:
         self._resolved = {}
+        self._in_progress = InProgress()
 
     def can_resolve(self, raw_spec: str, ctx: Ctx):
         if raw_spec.startswith(f"{CONF_RESOLVER_NAME}::"):
@@ -80,24 +83,32 @@ class ConfResolver:
     def resolve(self, raw_spec: str, ctx: Ctx) -> ConfDep:
         spec = parse_conf_spec(raw_spec, ctx)
 
-        if spec.fqn in self._resolved:
-            return self._resolved[spec.fqn]
-
-        if spec.fqn == self.root_conf_dep:
-            d = ConfDep(
-                spec=spec,
-                ctx=ctx.global_ctx,
-                actions=[conf, build],
-                # Do not fail if root resolver func is not defined
-                failsafe=True,
-                ui_options={"visibility": "hidden"},
-            )
-        else:
-            d = ConfDep(spec=spec, ctx=ctx.new_child(), actions=[conf, build])
+        with self._in_progress:
+            # The same dependency requested from another thread waits until it's built
+            self._in_progress.wait(spec.fqn)
+
+            if spec.fqn in self._resolved:
+                return self._resolved[spec.fqn]
 
-        self._resolved[spec.fqn] = d
+            if spec.fqn == self.root_conf_dep:
+                d = ConfDep(
+                    spec=spec,
+                    ctx=ctx.global_ctx,
+                    actions=[conf, build],
+                    # Do not fail if root resolver func is not defined
+                    failsafe=True,
+                    ui_options={"visibility": "hidden"},
+                )
+            else:
+                d = ConfDep(spec=spec, ctx=ctx.new_child(), actions=[conf, build])
 
-        d.build()
+            self._resolved[spec.fqn] = d
+            self._in_progress.start(spec.fqn)
+
+        try:
+            d.build()
+        finally:
+            self._in_progress.finish(spec.fqn)
 
         return d
 
@@ -116,8 +127,7 @@ def setup(registry: Registry):
         global_ctx.update(
             {
                 actions.get_action_name(a): actions.prep_action_as_fn(a, ctx=global_ctx)
-                for a in vars(actions).values()
-                if actions.is_action(a)
+                for a in actions.COMMON_ACTIONS
             }
         )
         # set configuration from root `root_conf`
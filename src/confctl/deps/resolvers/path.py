@@ -1,8 +1,8 @@
 from __future__ import annotations
 
 import typing as t
-from pathlib import Path
 
+from confctl.utils.fs import ensure_dir, expand_path
 from .simple import simple_resolver
 
 if t.TYPE_CHECKING:
@@ -11,15 +11,15 @@ if t.TYPE_CHECKING:
 
 @simple_resolver("path")
 def path(act: Action):
-    p = Path(act.caller.spec.spec).expanduser()
+    p = expand_path(act.caller.spec.spec)
     # Makes sure the parent folder exist
-    p.parent.mkdir(exist_ok=True, parents=True)
+    ensure_dir(p.parent)
     return p
 
 
 @simple_resolver("dir")
 def dir(act: Action):
-    p = Path(act.caller.spec.spec).expanduser()
+    p = expand_path(act.caller.spec.spec)
     # Makes sure the given folder exist
-    p.mkdir(exist_ok=True, parents=True)
+    ensure_dir(p)
     return p
\ No newline at end of file
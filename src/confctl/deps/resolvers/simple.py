@@ -33,6 +33,7 @@ def simple_resolver(name: str):
 
                 return dep.run()
 
+        _Resolver.name = name
 
         def _setup(registry: Registry):
             registry.register_resolver(_Resolver())
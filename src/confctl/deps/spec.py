@@ -1,7 +1,8 @@
 from dataclasses import dataclass
+from functools import cache, cached_property
 
 
-@dataclass
+@dataclass(frozen=True)
 class Spec:
     raw_spec: str
 
@@ -11,7 +12,8 @@ class Spec:
     def __str__(self) -> str:
         return self.fqn
 
-    @property
+    # specs are frozen, so `fqn` (and its str hash) is computed once
+    @cached_property
     def fqn(self):
         return f"{self.resolver_name}::{self.spec}"
 
@@ -19,6 +21,7 @@ class Spec:
         return hash(self.fqn)
 
 
+@cache
 def parse_spec(raw_spec: str, default_resolver_name: str):
     """General spec parser
 
@@ -1,3 +1,5 @@
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
 from multiprocessing import Process
 from multiprocessing.connection import Connection
 from pathlib import Path
@@ -16,7 +18,9 @@ DEFAULT_RESOLVERS = [
 ]
 
 
-def build_specs(specs: list[str], configs_root: Path, events_channel: Connection):
+def build_specs(
+    specs: list[str], configs_root: Path, events_channel: Connection, jobs: int = 1
+):
     ops_tracking = OpsTracking(events_channel)
 
     with ops_tracking.op("build/specs") as op:
@@ -35,20 +39,37 @@ def build_specs(specs: list[str], configs_root: Path, events_channel: Connection
         op.debug("Resolving specs...")
         if not specs:
             specs = ['conf:::main']
-        for spec in specs:
-            op.debug(f"Start resolving {spec}")
-            registry.resolve(spec)
+
+        if jobs > 1:
+            # Independent specs are built concurrently (mostly waiting on subprocesses),
+            # shared dependencies are built once (see resolvers).
+            with ThreadPoolExecutor(max_workers=jobs) as executor:
+                futures = []
+                for spec in specs:
+                    op.debug(f"Start resolving {spec}")
+                    futures.append(
+                        executor.submit(copy_context().run, registry.resolve, spec)
+                    )
+                for future in futures:
+                    future.result()
+        else:
+            for spec in specs:
+                op.debug(f"Start resolving {spec}")
+                registry.resolve(spec)
 
         op.debug("Finished.")
 
 
-def run_worker(specs: list[str], configs_root: Path, events_channel: Channel):
+def run_worker(
+    specs: list[str], configs_root: Path, events_channel: Channel, jobs: int = 1
+):
     proc = Process(
         target=build_specs,
         kwargs={
             "specs": specs,
             "configs_root": configs_root,
             "events_channel": events_channel,
+            "jobs": jobs,
         },
         daemon=True,
     )
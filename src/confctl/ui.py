@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import time
 import typing as t
-from collections import defaultdict
+from collections import defaultdict, deque
 from dataclasses import dataclass, field
 from inspect import isclass
 from pathlib import Path
@@ -18,6 +18,8 @@ from confctl.wire.channel import AsyncChannel
 
 CWD = str(Path.cwd().absolute())
 HOME = str(Path.home().absolute())
+# Only the tail of op logs is ever displayed, so keep just the latest entries
+LOGS_BUFFER_SIZE = 256
 
 class RenderFn(ConsoleRenderable):
     def __init__(self, render):
@@ -66,11 +68,14 @@ class OpBase(ConsoleRenderable):
     render_logs: tree.Tree | None = None
     error: str | None = None
     stop_reason: tuple[str, dict | None] | None = None
-    logs: list[str] = field(default_factory=list)
+    logs: deque[str] = field(default_factory=lambda: deque(maxlen=LOGS_BUFFER_SIZE))
+    logs_lines_count: int = 0
     show_content: bool = True
     show_logs: bool = False
     show_logs_lines: int = 5
     data: OpData = field(default_factory=OpData)
+    # Set whenever the op or any of its sub-ops got an event since the last `build_ui`
+    dirty: bool = True
 
     bubble_ops_deps: bool = False
 
@@ -85,7 +90,7 @@ class OpBase(ConsoleRenderable):
     @property
     def elapsed(self):
         if self.started_at is not None:
-            finished_at = self.finished_at or time.time()
+            finished_at = self.finished_at or time.monotonic()
             new_elapsed = finished_at - self.started_at
             # Make sure we get increasing time
             if new_elapsed >= self.elapsed_time:
@@ -139,16 +144,25 @@ class OpBase(ConsoleRenderable):
 
     def _render_deps(self):
         if self.render_node:
+            rendered_labels = {
+                node.label
+                for node in self.render_node.children
+                if isinstance(node.label, str)
+            }
             deps = self._walk_ops(self.ops, lambda _op: _op.op_name == "use/dep")
             for dep in deps:
                 if isinstance(dep, OpUseDep):
                     dep_text = f"📎 {dep.name}"
-                    if all(
-                        dep_text != node.label for node in self.render_node.children
-                    ):
+                    if dep_text not in rendered_labels:
                         self.render_node.add(dep_text)
+                        rendered_labels.add(dep_text)
 
     def build_ui(self, parent_node: tree.Tree):
+        if self.render_node is not None and self.is_finished and not self.dirty:
+            # Nothing has changed since the last time, the rendered tree is up to date
+            return
+        self.dirty = False
+
         if self.render_node is None:
             self.render_node = parent_node.add(self._build_header())
         else:
@@ -169,6 +183,7 @@ class OpBase(ConsoleRenderable):
         if not log.endswith("\n"):
             log = f"{log}\n"
         self.logs.append(log)
+        self.logs_lines_count += log.count("\n")
 
     def handle_start(self, op_time: float):
         self.started_at = op_time
@@ -187,7 +202,7 @@ class OpBase(ConsoleRenderable):
         """Tracks an exception/error caught during op execution."""
         self.error = error
         if (tb):
-            self.logs.append(tb)
+            self.handle_log(tb)
 
     def handle_finish(self, op_time: float):
         """Called after operation is finished (even if error has happened)."""
@@ -204,6 +219,8 @@ class OpBase(ConsoleRenderable):
 
 class UIBuildTargetHeader(ConsoleRenderable):
     op: OpBuildDep
+    # The header of a finished op does not change anymore
+    final_state: RenderableType | None = None
 
     def __init__(self, op: OpBuildDep):
         self.op = op
@@ -235,7 +252,14 @@ class UIBuildTargetHeader(ConsoleRenderable):
         return f"? {name}"
 
     def __rich_console__(self, *args):
-        yield self.render_target_state()
+        if self.final_state is not None:
+            yield self.final_state
+            return
+
+        state = self.render_target_state()
+        if self.op.is_finished:
+            self.final_state = state
+        yield state
 
 
 class UIOpLogs(ConsoleRenderable):
@@ -244,23 +268,33 @@ class UIOpLogs(ConsoleRenderable):
     def __init__(self, op: OpBase):
         self.op = op
 
-    def render_logs(self, logs: list[str], max_output=5):
-        logs_text = "".join(logs)
-        nl_count = logs_text.count("\n")
-        logs_text.find("\n")
+    def render_logs(self, logs: t.Reversible[str], lines_count: int, max_output=5):
+        # Only the tail is displayed, so do not join (potentially huge) logs entirely
+        tail: list[str] = []
+        tail_lines_count = 0
+        for log in reversed(logs):
+            tail.append(log)
+            tail_lines_count += log.count("\n")
+            if tail_lines_count > max_output + 1:
+                break
+        logs_text = "".join(reversed(tail))
 
         logs = logs_text.rsplit('\n', maxsplit=max_output+1)
 
         log_lines = (
-            f"... truncated {nl_count - max_output} line(s) ...\n"
-            if nl_count > max_output
+            f"... truncated {lines_count - max_output} line(s) ...\n"
+            if lines_count > max_output
             else ""
         ) + ("\n".join(logs[-max_output:]))
         return Panel(log_lines.strip(), title="Logs", title_align="left")
 
     def __rich_console__(self, *args):
         if self.op.logs:
-            yield self.render_logs(self.op.logs, max_output=self.op.show_logs_lines)
+            yield self.render_logs(
+                self.op.logs,
+                lines_count=self.op.logs_lines_count,
+                max_output=self.op.show_logs_lines,
+            )
 
 
 class UIRenderStr(ConsoleRenderable):
@@ -422,6 +456,8 @@ class OpUseDep(OpBase):
 
 class UIRunBrewHeader(ConsoleRenderable):
     op: OpBase
+    # The header of a finished op does not change anymore
+    final_state: RenderableType | None = None
 
     def __init__(self, op: OpBase):
         self.op = op
@@ -462,7 +498,14 @@ class UIRunBrewHeader(ConsoleRenderable):
         return f"? {name}"
 
     def __rich_console__(self, *args):
-        yield self.render_install_state()
+        if self.final_state is not None:
+            yield self.final_state
+            return
+
+        state = self.render_install_state()
+        if self.op.is_finished:
+            self.final_state = state
+        yield state
 
 @dataclass
 class OpRunBrew(OpBase):
@@ -516,50 +559,65 @@ class OpsView(ConsoleRenderable):
                 return node
         return None
 
+    def mark_dirty(self, op_path: tuple[str, ...]):
+        for l in range(len(op_path), 0, -1):
+            op = self.ops_map.get(op_path[:l])
+            if op is not None:
+                op.dirty = True
+
     def build_op(self, op_name: str, op_data):
         if cls := OPS_UI_MAP.get(op_name):
             return cls(op_name=op_name, data=op_data)
         return OpBase(op_name=op_name, data=op_data)
 
     async def listen_to_channel(self, channel: AsyncChannel):
-        async for event in channel.recv():
-            match event:
-                case events.EvOpStart() as ev:
-                    op = self.build_op(op_name=ev.op, op_data=ev.data)
-
-                    if self.root_op is None and isinstance(op, OpBuildConfigs):
-                        self.root_op = op
-
-                    parent = self.get_parent_node(ev.op_path)
-                    if self.root_op and isinstance(op, OpBuildDep):
-                        self.root_op.ops.append(op)
-                    elif parent:
-                        parent.ops.append(op)
-
-                    self.ops_map[ev.op_path] = op
-
-                    op.handle_start(ev.ts)
-
-                case events.EvOpLog(op_path=op_path, log=log):
-                    op = self.ops_map[op_path]
-                    op.handle_log(log)
-                case events.EvOpProgress(op_path=op_path, data=data):
-                    op = self.ops_map[op_path]
-                    op.handle_progress(**data)
-                case events.EvOpError(op_path=op_path, error=error, tb=tb):
-                    op = self.ops_map[op_path]
-                    op.handle_error(error, tb)
-                case events.EvOpStop(op_path=op_path, reason=reason, data=data):
-                    op = self.ops_map[op_path]
-                    op.handle_stop(reason, data)
-                case events.EvOpFinish(op_path=op_path, op=op_name, ts=ts):
-                    op = self.ops_map[op_path]
-                    op.handle_finish(ts)
-                    if op_name == "build/specs":
-                        return
-                case events.EvDebug(op_path=op_path, log=log):
-                    op = self.root_op if self.root_op else self.ops_map[op_path]
-                    op.handle_log(f"DEBUG: {log}\n")
+        while True:
+            # Handle everything received so far at once, the UI is redrawn separately
+            for event in await channel.recv_batch():
+                if self.handle_event(event):
+                    return
+
+    def handle_event(self, event: events.Event) -> bool:
+        """Updates ops state, returns `True` once the whole build is finished."""
+        self.mark_dirty(event.op_path)
+        match event:
+            case events.EvOpStart() as ev:
+                op = self.build_op(op_name=ev.op, op_data=ev.data)
+
+                if self.root_op is None and isinstance(op, OpBuildConfigs):
+                    self.root_op = op
+
+                parent = self.get_parent_node(ev.op_path)
+                if self.root_op and isinstance(op, OpBuildDep):
+                    self.root_op.ops.append(op)
+                elif parent:
+                    parent.ops.append(op)
+
+                self.ops_map[ev.op_path] = op
+
+                op.handle_start(ev.ts)
+
+            case events.EvOpLog(op_path=op_path, log=log):
+                op = self.ops_map[op_path]
+                op.handle_log(log)
+            case events.EvOpProgress(op_path=op_path, data=data):
+                op = self.ops_map[op_path]
+                op.handle_progress(**data)
+            case events.EvOpError(op_path=op_path, error=error, tb=tb):
+                op = self.ops_map[op_path]
+                op.handle_error(error, tb)
+            case events.EvOpStop(op_path=op_path, reason=reason, data=data):
+                op = self.ops_map[op_path]
+                op.handle_stop(reason, data)
+            case events.EvOpFinish(op_path=op_path, op=op_name, ts=ts):
+                op = self.ops_map[op_path]
+                op.handle_finish(ts)
+                if op_name == "build/specs":
+                    return True
+            case events.EvDebug(op_path=op_path, log=log):
+                op = self.root_op if self.root_op else self.ops_map[op_path]
+                op.handle_log(f"DEBUG: {log}\n")
+        return False
 
     def __rich_console__(self, *args):
         yield self.root_op if self.root_op else "Loading..."
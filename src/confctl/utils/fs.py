@@ -0,0 +1,19 @@
+from functools import lru_cache
+from pathlib import Path
+
+
+@lru_cache(maxsize=4096)
+def expand_path(path: str | Path) -> Path:
+    """`Path(path).expanduser()`, the same paths are used over and over in builds."""
+    return Path(path).expanduser()
+
+
+def ensure_dir(path: Path) -> Path:
+    """
+    Makes sure `path` folder (and its parents) exists.
+
+    Checks first: a `stat` is cheaper than `mkdir(exist_ok=True)` on an existing folder.
+    """
+    if not path.is_dir():
+        path.mkdir(parents=True, exist_ok=True)
+    return path
@@ -1,23 +1,43 @@
 import importlib.util
+import sys
+import threading
 import types
 
 from functools import cache
+from hashlib import sha1
 from importlib import import_module
 from pathlib import Path
 
 
+# re-entrant: a module being executed may load other modules
+_loading_lock = threading.RLock()
+
+
 @cache
 def load_python_module(path: Path | str):
     if isinstance(path, str):
         # expecting a python module path
         return import_module(path)
 
-    # expecting a fs path to a python module
-    spec = importlib.util.spec_from_file_location("tmp", path)
-    if spec is not None and spec.loader is not None:
-        module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(module)
-        return module
+    # expecting a fs path to a python module,
+    # a unique name lets `sys.modules` lookups (pickle, dataclasses, inspect) work
+    module_name = f"confbuild_{sha1(str(path).encode()).hexdigest()}"
+
+    # deps can be built concurrently, a module must be executed only once
+    with _loading_lock:
+        if (module := sys.modules.get(module_name)) is not None:
+            return module
+
+        spec = importlib.util.spec_from_file_location(module_name, path)
+        if spec is not None and spec.loader is not None:
+            module = importlib.util.module_from_spec(spec)
+            sys.modules[module_name] = module
+            try:
+                spec.loader.exec_module(module)
+            except BaseException:
+                sys.modules.pop(module_name, None)
+                raise
+            return module
 
     raise ImportError(f"{path} cannot be loaded or found.")
 
@@ -1,16 +1,102 @@
-from dataclasses import dataclass
-from typing import Callable
+import os
+from dataclasses import dataclass, field
+from functools import cache, lru_cache
+from hashlib import sha1
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable
 
-from jinja2 import Template as JinjaTemplate
+if TYPE_CHECKING:
+    from jinja2 import Environment, Template
 
 
 @dataclass
 class LazyTemplate:
     template: str
     render: Callable[[str], str]
+    _rendered: str | None = field(default=None, init=False, repr=False)
 
     def __str__(self) -> str:
-        return self.render(self.template)
+        if self._rendered is None:
+            self._rendered = self.render(self.template)
+        return self._rendered
 
 
-Template = JinjaTemplate
+@cache
+def get_environment() -> "Environment":
+    """
+    Jinja environment shared by all templates.
+
+    Templates never come from a loader, so there is nothing to auto reload.
+    Compiled templates are persisted in `$CONFCTL_CACHE_DIR/jinja`
+    (`$XDG_CACHE_HOME/confctl/jinja` or `~/.cache/confctl/jinja` by default) to be
+    reused by the next runs.
+    """
+    from jinja2 import Environment, FileSystemBytecodeCache
+
+    cache_dir = Path(
+        os.getenv("CONFCTL_CACHE_DIR")
+        or Path(os.getenv("XDG_CACHE_HOME") or "~/.cache") / "confctl"
+    ).expanduser()
+    try:
+        (cache_dir / "jinja").mkdir(parents=True, exist_ok=True)
+        bytecode_cache = FileSystemBytecodeCache(str(cache_dir / "jinja"))
+    except OSError:
+        bytecode_cache = None
+
+    return Environment(auto_reload=False, bytecode_cache=bytecode_cache)
+
+
+@lru_cache(maxsize=4096)
+def compile_template(source: str) -> "Template":
+    """
+    Compiles template source once; the compiled template is shared between renders,
+    so it must not be mutated (pass per-render values via `render(...)` instead).
+    """
+    env = get_environment()
+    bytecode_cache = env.bytecode_cache
+    if bytecode_cache is None:
+        return env.from_string(source)
+
+    # `from_string` never looks into the bytecode cache, so do what loaders do
+    name = sha1(source.encode()).hexdigest()
+    bucket = bytecode_cache.get_bucket(env, name, None, source)
+    if bucket.code is None:
+        bucket.code = env.compile(source)
+        try:
+            bytecode_cache.set_bucket(bucket)
+        except OSError:
+            pass
+
+    return env.template_class.from_code(env, bucket.code, env.make_globals(None))
+
+
+def render_template(template: "Template", context: dict, **extra) -> str:
+    """
+    Renders a compiled template straight through its root render function.
+
+    Same as `template.render(context, **extra)`, minus the two copies of the context
+    Jinja makes on every call. `context` is updated in place, so it must be a fresh
+    dict owned by the caller.
+    """
+    for key, value in template.globals.items():
+        context.setdefault(key, value)
+    context.update(extra)
+
+    jinja_ctx = template.new_context(context, shared=True)
+    try:
+        return template.environment.concat(template.root_render_func(jinja_ctx))
+    # same as `Template.render`: jinja re-raises any error with the template traceback
+    except Exception:  # noqa: BLE001
+        template.environment.handle_exception()
+
+
+def render_literal(source: str) -> str | None:
+    """
+    Renders `source` without Jinja if it has no template syntax at all.
+
+    Returns `None` if `source` must be rendered by Jinja.
+    """
+    if "{{" in source or "{%" in source or "{#" in source or "\r" in source:
+        return None
+    # Jinja drops a single trailing newline
+    return source.removesuffix("\n")
@@ -1,4 +1,6 @@
 import asyncio
+import pickle
+import struct
 from multiprocessing import Pipe
 from multiprocessing.connection import Connection
 from typing import Any, AsyncGenerator, Protocol
@@ -8,78 +10,105 @@ class Channel(Protocol):
     def send(self, ev: Any, /) -> None:
         ...
 
-    def recv(self) -> Any:
-        ...
-
 
 class AsyncChannel(Protocol):
-    def send(self, ev: Any, /) -> None:
-        ...
-
     async def recv(self) -> AsyncGenerator:
         ...
 
-    def reset_sleeping_delay(self):
+    async def recv_batch(self, max_n: int | None = None) -> list:
         ...
 
 
 def create_channel() -> tuple[AsyncChannel, Channel]:
     """
-    Bi-directional channel with async interface on one side and sync on the other.
+    Uni-directional channel with async interface on one side and sync on the other.
+
+    A (primary) <- B (secondary) channel.
 
-    A (primary) <-> B (secondary) channel.
+    Primary point provides async capabilities to listen to events.
+    Secondary point provides sync method to send events.
 
-    Primary point provides async capabilities to listen to events and sync method to send events.
-    Secondary channel provides sync capabilities to listen to events and sync method to send events.
+    Non-duplex `Pipe` is backed by a plain `os.pipe()` (rather than a socket pair).
     """
-    primary_conn, secondary_conn = Pipe(duplex=True)
+    primary_conn, secondary_conn = Pipe(duplex=False)
     return AsyncConn(primary_conn), secondary_conn
 
 
 class AsyncConn:
-    DEFAULT_SLEEP = 0.05
-    MAX_SLEEP = 3
-    GROWING_SLEEP_MULTIPLIER = 1.5
-
     _conn: Connection
+    _events: asyncio.Queue | None
 
     def __init__(self, conn: Connection) -> None:
         self._conn = conn
-        self._reset_sleeping_delay = asyncio.Event()
-        self._sleeping_delay = self.DEFAULT_SLEEP
-
-    def send(self, ev, /):
-        self._conn.send(ev)
-
-    def reset_sleeping_delay(self):
-        self._reset_sleeping_delay.set()
+        self._events = None
 
     async def recv(self):
-        loop = asyncio.get_running_loop()
-
         while True:
-            if self._conn.poll():
-                ev = self._conn.recv()
-                await asyncio.sleep(0.01)
-                self._sleeping_delay = self.DEFAULT_SLEEP
+            for ev in await self.recv_batch():
                 yield ev
-            else:
-                self._reset_sleeping_delay.clear()
-                sleeping_reset = loop.create_task(self._reset_sleeping_delay.wait())
-                wait_timeout = loop.create_task(asyncio.sleep(self._sleeping_delay))
-                _, pending = await asyncio.wait(
-                    [sleeping_reset, wait_timeout],
-                    return_when=asyncio.FIRST_COMPLETED,
-                )
-                for t in pending:
-                    t.cancel()
-
-                if self._reset_sleeping_delay.is_set():
-                    # means we explicitly triggered `_reset_sleeping_delay` event
-                    self._sleeping_delay = self.DEFAULT_SLEEP
-                else:
-                    # means we exceeded `self._sleeping_delay`
-                    self._sleeping_delay = min(
-                        self._sleeping_delay * self.GROWING_SLEEP_MULTIPLIER,
-                        self.MAX_SLEEP,
-                    )
+
+    async def recv_batch(self, max_n: int | None = None) -> list:
+        """Waits for incoming events and drains (up to `max_n` of) them at once."""
+        if self._events is None:
+            await self._connect()
+        assert self._events is not None
+
+        batch = [await self._events.get()]
+        while (max_n is None or len(batch) < max_n) and not self._events.empty():
+            batch.append(self._events.get_nowait())
+
+        if _EOF in batch:
+            # deliver what was received before EOF, next calls keep raising EOFError
+            batch = batch[: batch.index(_EOF)]
+            self._events.put_nowait(_EOF)
+            if not batch:
+                raise EOFError
+        return batch
+
+    async def _connect(self):
+        # Let the event loop read and decode the pipe, we just pick up ready events
+        self._events = events = asyncio.Queue()
+        loop = asyncio.get_running_loop()
+        await loop.connect_read_pipe(lambda: _EventsProtocol(events), self._conn)
+
+
+_EOF = object()
+
+
+class _EventsProtocol(asyncio.Protocol):
+    """
+    Decodes frames written by `Connection.send()`.
+
+    A frame is a `!i` size header (or `-1` followed by a `!Q` size for huge payloads)
+    and a pickled object.
+    """
+
+    def __init__(self, events: asyncio.Queue) -> None:
+        self._events = events
+        self._buf = bytearray()
+
+    def data_received(self, data: bytes) -> None:
+        buf = self._buf
+        buf += data
+
+        pos = 0
+        while len(buf) - pos >= 4:
+            (size,) = struct.unpack_from("!i", buf, pos)
+            header_size = 4
+            if size == -1:
+                if len(buf) - pos < 12:
+                    break
+                (size,) = struct.unpack_from("!Q", buf, pos + 4)
+                header_size = 12
+
+            frame_end = pos + header_size + size
+            if len(buf) < frame_end:
+                break
+
+            self._events.put_nowait(pickle.loads(buf[pos + header_size : frame_end]))
+            pos = frame_end
+
+        del buf[:pos]
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        self._events.put_nowait(_EOF)
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import threading
 import time
 from dataclasses import dataclass, field
 from functools import partial
@@ -17,25 +18,25 @@ Op = str
 active_op_path: ContextVar[OpPath] = ContextVar("active_op_path", default=())
 
 
-@dataclass
+@dataclass(slots=True)
 class Ev:
     typ: str
 
 
-@dataclass
+@dataclass(slots=True)
 class EvOp(Ev):
     op: Op
     op_path: OpPath
 
 
-@dataclass
+@dataclass(slots=True)
 class EvOpStart(EvOp):
     typ: t.Literal["op/start"] = field(default="op/start", init=False)
     data: dict
-    ts: float = field(default_factory=time.time, init=False)
+    ts: float = field(default_factory=time.monotonic, init=False)
 
 
-@dataclass
+@dataclass(slots=True)
 class EvOpStop(EvOp):
     typ: t.Literal["op/stop"] = field(default="op/stop", init=False)
     reason: str
@@ -49,32 +50,32 @@ class ForceStop(Exception):
         self.data = data
 
 
-@dataclass
+@dataclass(slots=True)
 class EvOpLog(EvOp):
     typ: t.Literal["op/log"] = field(default="op/log", init=False)
     log: str
 
 
-@dataclass
+@dataclass(slots=True)
 class EvOpProgress(EvOp):
     typ: t.Literal["op/progress"] = field(default="op/progress", init=False)
     data: dict
 
 
-@dataclass
+@dataclass(slots=True)
 class EvOpError(EvOp):
     typ: t.Literal["op/error"] = field(default="op/error", init=False)
     error: str
     tb: str
 
 
-@dataclass
+@dataclass(slots=True)
 class EvOpFinish(EvOp):
     typ: t.Literal["op/finish"] = field(default="op/finish", init=False)
-    ts: float = field(default_factory=time.time)
+    ts: float = field(default_factory=time.monotonic)
 
 
-@dataclass
+@dataclass(slots=True)
 class EvDebug(Ev):
     typ: t.Literal["internal/debug"] = field(default="internal/debug", init=False)
     op_path: OpPath
@@ -117,9 +118,12 @@ class OpsTracking:
 
     def __init__(self, events_channel: Connection):
         self._ev_channel = events_channel
+        # ops can be tracked from several threads, frames must not interleave
+        self._ev_lock = threading.Lock()
 
     def ev(self, ev: Event):
-        self._ev_channel.send(ev)
+        with self._ev_lock:
+            self._ev_channel.send(ev)
 
     @contextmanager
     def op(self, op_name: str, **data):
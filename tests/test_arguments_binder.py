@@ -0,0 +1,72 @@
+import unittest
+
+from inspect import signature
+
+from confctl.deps.actions import arguments_binder
+
+
+def positional(act, a, b=2, /, c=3):
+    ...
+
+
+def keyword_only(act, a, *, b, c=3):
+    ...
+
+
+def varargs(act, a, *args, b=2, **kwargs):
+    ...
+
+
+def no_params(act):
+    ...
+
+
+CALLS = [
+    ((), {}),
+    ((1,), {}),
+    ((1, 2), {}),
+    ((1, 2, 3), {}),
+    ((1, 2, 3, 4, 5), {}),
+    ((1,), {"b": 5}),
+    ((1,), {"c": 5}),
+    ((), {"a": 1, "b": 5}),
+    ((1,), {"a": 1}),
+    ((1,), {"b": 5, "d": 6}),
+    ((1, 2), {"c": 5, "x": 6}),
+]
+
+
+def bind_with_signature(fn, args, kwargs):
+    bound = signature(fn).bind(None, *args, **kwargs)
+    bound.apply_defaults()
+    arguments = dict(bound.arguments)
+    del arguments["act"]
+    return arguments
+
+
+class ArgumentsBinderTest(unittest.TestCase):
+    def test_same_as_signature_bind(self):
+        for fn in (positional, keyword_only, varargs, no_params):
+            bind = arguments_binder(signature(fn))
+            for args, kwargs in CALLS:
+                with self.subTest(fn=fn.__name__, args=args, kwargs=kwargs):
+                    try:
+                        expected = bind_with_signature(fn, args, kwargs)
+                    except TypeError:
+                        with self.assertRaises(TypeError):
+                            bind(args, kwargs)
+                    else:
+                        self.assertEqual(bind(args, kwargs), expected)
+
+    def test_keeps_argument_order(self):
+        bind = arguments_binder(signature(varargs))
+        self.assertEqual(
+            list(bind((1, 2), {"x": 3, "b": 4})),
+            list(bind_with_signature(varargs, (1, 2), {"x": 3, "b": 4})),
+        )
+
+    def test_does_not_change_passed_kwargs(self):
+        bind = arguments_binder(signature(varargs))
+        kwargs = {"b": 1, "x": 2}
+        bind((1,), kwargs)
+        self.assertEqual(kwargs, {"b": 1, "x": 2})
@@ -0,0 +1,64 @@
+import asyncio
+import os
+import pickle
+import struct
+import unittest
+
+from multiprocessing import Pipe
+
+from confctl.wire.channel import _EOF, _EventsProtocol
+
+EVENTS = [None, "event", {"ev": "op", "data": list(range(100))}, b"x" * 5000]
+
+
+def write_frames(events) -> bytes:
+    """Frames as written by `Connection.send()` (must fit into the pipe buffer)."""
+    reader, writer = Pipe(duplex=False)
+    with reader, writer:
+        for ev in events:
+            writer.send(ev)
+        writer.close()
+        data = b""
+        while chunk := os.read(reader.fileno(), 65536):
+            data += chunk
+    return data
+
+
+def huge_frame(ev) -> bytes:
+    """A frame with the header `Connection.send()` uses for payloads over 2 GiB."""
+    payload = pickle.dumps(ev)
+    return struct.pack("!i", -1) + struct.pack("!Q", len(payload)) + payload
+
+
+def decode(data: bytes, chunk_size: int) -> list:
+    events: asyncio.Queue = asyncio.Queue()
+    protocol = _EventsProtocol(events)
+    for pos in range(0, len(data), chunk_size):
+        protocol.data_received(data[pos : pos + chunk_size])
+    protocol.connection_lost(None)
+
+    decoded = []
+    while (ev := events.get_nowait()) is not _EOF:
+        decoded.append(ev)
+    return decoded
+
+
+class EventsProtocolTest(unittest.TestCase):
+    def test_decodes_frames_of_connection(self):
+        data = write_frames(EVENTS)
+        for chunk_size in (len(data), 65536, 7, 1):
+            with self.subTest(chunk_size=chunk_size):
+                self.assertEqual(decode(data, chunk_size), EVENTS)
+
+    def test_decodes_huge_frame_header(self):
+        data = huge_frame("huge") + write_frames(["next"])
+
+        # the same bytes are understood by `Connection.recv()`
+        reader, writer = Pipe(duplex=False)
+        with reader, writer:
+            os.write(writer.fileno(), data)
+            self.assertEqual([reader.recv(), reader.recv()], ["huge", "next"])
+
+        for chunk_size in (len(data), 5, 1):
+            with self.subTest(chunk_size=chunk_size):
+                self.assertEqual(decode(data, chunk_size), ["huge", "next"])
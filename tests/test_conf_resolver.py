@@ -0,0 +1,100 @@
+import sys
+import tempfile
+import unittest
+from multiprocessing import Process
+from pathlib import Path
+
+from confctl.deps.worker import build_specs
+from confctl.wire.events import EvOpError
+
+
+class EventsSink:
+    def __init__(self) -> None:
+        self.events = []
+
+    def send(self, ev):
+        self.events.append(ev)
+
+
+def build_or_fail(specs: list[str], configs_root: Path, jobs: int):
+    events = EventsSink()
+    build_specs(specs, configs_root, events, jobs=jobs)
+    if any(isinstance(ev, EvOpError) for ev in events.events):
+        sys.exit(1)
+
+
+class ConfResolverTest(unittest.TestCase):
+    def write_conf(self, root: Path, name: str, body: str):
+        conf_dir = root / "tools" / name
+        conf_dir.mkdir(parents=True)
+        (conf_dir / ".confbuild.py").write_text(body)
+
+    def test_dependency_cycle_across_threads(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            # both builds are running before either requests the other one
+            self.write_conf(
+                root,
+                "b",
+                "import time\n"
+                "def b(conf):\n"
+                "    time.sleep(0.2)\n"
+                "    conf.dep('conf::tools/c')\n"
+                "    conf(done=True)\n",
+            )
+            self.write_conf(
+                root,
+                "c",
+                "import time\n"
+                "def c(conf):\n"
+                "    time.sleep(0.2)\n"
+                "    conf.dep('conf::tools/b')\n"
+                "    conf(done=True)\n",
+            )
+
+            # a deadlocked build cannot be interrupted, so it runs in a process
+            worker = Process(
+                target=build_or_fail,
+                args=(["conf::tools/b", "conf::tools/c"], root, 2),
+                daemon=True,
+            )
+            worker.start()
+            worker.join(timeout=10)
+
+            if worker.is_alive():
+                worker.terminate()
+                self.fail("build_specs deadlocked")
+            self.assertEqual(worker.exitcode, 0)
+
+    def test_module_shared_by_concurrent_targets_is_loaded_once(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            loads = root / "loads.txt"
+            self.write_conf(
+                root,
+                "m",
+                "import time\n"
+                f"with open({str(loads)!r}, 'a') as f:\n"
+                "    f.write('loaded\\n')\n"
+                "time.sleep(0.2)\n"
+                "def one(conf):\n"
+                "    pass\n"
+                "def two(conf):\n"
+                "    pass\n",
+            )
+
+            worker = Process(
+                target=build_or_fail,
+                args=(["conf::tools/m:one", "conf::tools/m:two"], root, 2),
+                daemon=True,
+            )
+            worker.start()
+            worker.join(timeout=10)
+
+            self.assertFalse(worker.is_alive())
+            self.assertEqual(worker.exitcode, 0)
+            self.assertEqual(loads.read_text(), "loaded\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+
+from collections import ChainMap
+
+from confctl.deps.ctx import Ctx
+
+
+class CtxTest(unittest.TestCase):
+    def test_parent_write_invalidates_child_snapshot(self):
+        parent = Ctx()
+        parent["a"] = 1
+        child = parent.new_child(b=2)
+        self.assertEqual(child["a"], 1)
+
+        parent["a"] = 10
+        parent["c"] = 3
+        self.assertEqual(child["a"], 10)
+        self.assertEqual(child.c, 3)
+
+        del parent["c"]
+        self.assertNotIn("c", child)
+
+        parent.maps[0] |= {"a": 11}
+        self.assertEqual(child.get("a"), 11)
+
+    def test_child_write_does_not_leak_to_parent(self):
+        parent = Ctx()
+        parent["a"] = 1
+        child = parent.new_child()
+        child["a"] = 2
+        self.assertEqual((parent["a"], child["a"]), (1, 2))
+
+    def test_foreign_layer_stays_live(self):
+        layer = {"a": 1}
+        ctx = Ctx().new_child(layer)
+        self.assertEqual(ctx["a"], 1)
+
+        layer["a"] = 2
+        layer["b"] = 3
+        self.assertEqual((ctx["a"], ctx.get("b")), (2, 3))
+
+    def test_same_as_chain_map(self):
+        grandparent = Ctx()
+        grandparent.update(a=1, b=1, c=1)
+        parent = grandparent.new_child(b=2)
+        ctx = parent.new_child(c=3, d=3)
+        reference = ChainMap(dict(c=3, d=3), dict(b=2), dict(a=1, b=1, c=1))
+
+        self.assertEqual(ctx.flatten(), dict(reference))
+        for key in "abcdx":
+            with self.subTest(key=key):
+                self.assertEqual(key in ctx, key in reference)
+                self.assertEqual(ctx.get(key), reference.get(key))
@@ -0,0 +1,75 @@
+import threading
+import unittest
+
+from confctl.deps.in_progress import InProgress
+
+
+class InProgressTest(unittest.TestCase):
+    def test_recursive_request_does_not_wait(self):
+        in_progress = InProgress()
+        with in_progress:
+            in_progress.start("conf::a")
+
+        with in_progress:
+            # returns right away for the thread building the dep
+            in_progress.wait("conf::a")
+            self.assertTrue(in_progress.is_building("conf::a"))
+
+        in_progress.finish("conf::a")
+        self.assertFalse(in_progress.is_building("conf::a"))
+
+    def test_other_thread_waits_until_built(self):
+        in_progress = InProgress()
+        with in_progress:
+            in_progress.start("conf::a")
+
+        events = []
+
+        def request():
+            with in_progress:
+                in_progress.wait("conf::a")
+                events.append("resolved")
+
+        waiter = threading.Thread(target=request)
+        waiter.start()
+        waiter.join(timeout=0.2)
+        self.assertTrue(waiter.is_alive())
+
+        events.append("built")
+        in_progress.finish("conf::a")
+        waiter.join(timeout=5)
+        self.assertEqual(events, ["built", "resolved"])
+
+    def test_cycle_between_threads_does_not_wait(self):
+        in_progress = InProgress()
+        a_started = threading.Event()
+        b_started = threading.Event()
+        results = []
+
+        def build(own: str, other: str, started, other_started):
+            with in_progress:
+                in_progress.start(own)
+            started.set()
+            other_started.wait(5)
+            with in_progress:
+                in_progress.wait(other)
+                results.append((own, in_progress.is_building(other)))
+            in_progress.finish(own)
+
+        threads = [
+            threading.Thread(target=build, args=("a", "b", a_started, b_started)),
+            threading.Thread(target=build, args=("b", "a", b_started, a_started)),
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=5)
+
+        self.assertFalse(any(thread.is_alive() for thread in threads))
+        # one of the builds gets the other one partially built
+        self.assertEqual(len(results), 2)
+        self.assertIn(True, [building for _, building in results])
+
+
+if __name__ == "__main__":
+    unittest.main()
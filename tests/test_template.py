@@ -0,0 +1,38 @@
+import unittest
+
+from jinja2 import Environment
+
+from confctl.utils.template import render_literal
+
+SOURCES = [
+    "",
+    "text",
+    "text\n",
+    "text\n\n",
+    "\n",
+    "\n\n",
+    "line 1\nline 2\n",
+    "  indented\n  ",
+    "braces { } {x} }} %} #}",
+    "{ {",
+    "text\r\n",
+    "text\r",
+    "{{ 1 + 1 }}",
+    "{% if true %}x{% endif %}\n",
+    "{# comment #}text",
+]
+
+
+class RenderLiteralTest(unittest.TestCase):
+    def test_same_as_jinja(self):
+        env = Environment()
+        for source in SOURCES:
+            with self.subTest(source=source):
+                rendered = render_literal(source)
+                if rendered is not None:
+                    self.assertEqual(rendered, env.from_string(source).render())
+
+    def test_leaves_template_syntax_to_jinja(self):
+        for source in ("{{ x }}", "{% raw %}{% endraw %}", "{# x #}", "a\r\nb"):
+            with self.subTest(source=source):
+                self.assertIsNone(render_literal(source))